@@ -1,81 +1,118 @@
 """Configuration settings for YouTrack to Linear migration."""
 
 import os
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Dict
 
-# Load environment variables from .env file
-load_dotenv()
+from dotenv import load_dotenv
 
 
-class YouTrackConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class YouTrackConfig:
     """YouTrack API configuration."""
-    base_url: str = Field(..., description="YouTrack instance URL (e.g., https://your-instance.myjetbrains.com/youtrack)")
-    api_token: str = Field(..., description="YouTrack permanent API token")
-    project_key: Optional[str] = Field(None, description="Project key to filter issues (optional)")
-    batch_size: int = Field(100, description="Number of issues to fetch per API call")
+    base_url: str  # YouTrack instance URL (e.g., https://your-instance.myjetbrains.com/youtrack)
+    api_token: str  # YouTrack permanent API token
+    project_key: Optional[str] = None  # Project key to filter issues (optional)
+    batch_size: int = 500  # Initial number of issues to fetch per API call (YouTrack sets no hard cap on $top)
+    min_batch_size: int = 10  # Smallest page size the adaptive batching may shrink to
+    max_batch_size: int = 1000  # Largest page size the adaptive batching may grow to
+    target_latency_s: float = 2.0  # Target wall-clock latency per page request (seconds)
+    batch_strategy: str = "aimd"  # Page size strategy: 'aimd' (adaptive) or 'tuned' (fitted once)
+    max_in_flight: int = 8  # Maximum number of page requests in flight at once
     
-    @validator('base_url')
-    def validate_base_url(cls, v):
-        if not v.startswith(('http://', 'https://')):
+    def __post_init__(self):
+        if not self.base_url.startswith(('http://', 'https://')):
             raise ValueError('base_url must start with http:// or https://')
-        return v.rstrip('/')
+        object.__setattr__(self, 'base_url', self.base_url.rstrip('/'))
+        
+        if self.max_in_flight < 1:
+            raise ValueError('max_in_flight must be at least 1')
+        
+        if min(self.batch_size, self.min_batch_size, self.max_batch_size) < 1:
+            raise ValueError('batch_size, min_batch_size and max_batch_size must be at least 1')
+        
+        if self.min_batch_size > self.max_batch_size:
+            raise ValueError('min_batch_size must not exceed max_batch_size')
+        
+        if self.batch_strategy not in ('aimd', 'tuned'):
+            raise ValueError("batch_strategy must be 'aimd' or 'tuned'")
 
 
-class LinearConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class LinearConfig:
     """Linear configuration."""
-    team_key: str = Field(..., description="Linear team key to import issues into")
-    default_state: Optional[str] = Field(None, description="Default state for imported issues (e.g., 'backlog', 'todo')")
+    team_key: str  # Linear team key to import issues into
+    default_state: Optional[str] = None  # Default state for imported issues (e.g., 'backlog', 'todo')
 
 
-class MigrationConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MigrationConfig:
     """Migration settings."""
-    output_dir: str = Field("./output", description="Directory to store exported data")
-    max_retries: int = Field(3, description="Maximum number of retries for API calls")
-    retry_delay: float = Field(1.0, description="Initial delay between retries (seconds)")
-    field_mapping: Dict[str, str] = Field(
+    output_dir: str = "./output"  # Directory to store exported data
+    max_retries: int = 3  # Maximum number of retries for API calls
+    retry_delay: float = 1.0  # Initial delay between retries (seconds)
+    
+    # Mapping of YouTrack fields to Linear fields
+    field_mapping: Dict[str, str] = field(
         default_factory=lambda: {
             'summary': 'title',
             'description': 'description',
             'created': 'createdAt',
             'updated': 'updatedAt',
             'idReadable': 'identifier',
-        },
-        description="Mapping of YouTrack fields to Linear fields"
+        }
     )
     
     # YouTrack fields to fetch
-    youtrack_fields: str = Field(
+    youtrack_fields: str = (
         "idReadable,summary,description,created,updated,resolved,reporter(name,email),"
-        "assignee(name,email),priority(name),state(name),tags(name),customFields(name,value)",
-        description="YouTrack API fields to fetch"
+        "assignee(name,email),priority(name),state(name),tags(name),customFields(name,value)"
     )
 
 
-class Config(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Config:
     """Main configuration."""
     youtrack: YouTrackConfig
     linear: LinearConfig
-    migration: MigrationConfig = Field(default_factory=MigrationConfig)
+    migration: MigrationConfig = field(default_factory=MigrationConfig)
     
     @classmethod
     def from_env(cls) -> 'Config':
-        """Create configuration from environment variables."""
-        return cls(
-            youtrack=YouTrackConfig(
-                base_url=os.getenv('YOUTRACK_URL', ''),
-                api_token=os.getenv('YOUTRACK_TOKEN', ''),
-                project_key=os.getenv('YOUTRACK_PROJECT_KEY'),
-                batch_size=int(os.getenv('YOUTRACK_BATCH_SIZE', '100'))
-            ),
-            linear=LinearConfig(
-                team_key=os.getenv('LINEAR_TEAM_KEY', ''),
-                default_state=os.getenv('LINEAR_DEFAULT_STATE')
-            ),
-            migration=MigrationConfig(
-                output_dir=os.getenv('OUTPUT_DIR', './output'),
-                max_retries=int(os.getenv('MAX_RETRIES', '3')),
-                retry_delay=float(os.getenv('RETRY_DELAY', '1.0'))
-            )
+        """Create configuration from environment variables.
+        
+        The environment (and .env file) is read once per process; later calls
+        return the same frozen instance.
+        """
+        return _config_from_env()
+
+
+@lru_cache(maxsize=1)
+def _config_from_env() -> Config:
+    """Build the configuration from the environment, once per process."""
+    # Load environment variables from .env file
+    load_dotenv()
+    
+    return Config(
+        youtrack=YouTrackConfig(
+            base_url=os.getenv('YOUTRACK_URL', ''),
+            api_token=os.getenv('YOUTRACK_TOKEN', ''),
+            project_key=os.getenv('YOUTRACK_PROJECT_KEY'),
+            batch_size=int(os.getenv('YOUTRACK_BATCH_SIZE', '500')),
+            min_batch_size=int(os.getenv('YOUTRACK_MIN_BATCH_SIZE', '10')),
+            max_batch_size=int(os.getenv('YOUTRACK_MAX_BATCH_SIZE', '1000')),
+            target_latency_s=float(os.getenv('YOUTRACK_TARGET_LATENCY', '2.0')),
+            batch_strategy=os.getenv('YOUTRACK_BATCH_STRATEGY', 'aimd'),
+            max_in_flight=int(os.getenv('YOUTRACK_MAX_IN_FLIGHT', '8'))
+        ),
+        linear=LinearConfig(
+            team_key=os.getenv('LINEAR_TEAM_KEY', ''),
+            default_state=os.getenv('LINEAR_DEFAULT_STATE')
+        ),
+        migration=MigrationConfig(
+            output_dir=os.getenv('OUTPUT_DIR', './output'),
+            max_retries=int(os.getenv('MAX_RETRIES', '3')),
+            retry_delay=float(os.getenv('RETRY_DELAY', '1.0'))
         )
+    )
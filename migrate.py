@@ -5,18 +5,22 @@ Simple YouTrack Export Tool
 This script exports issues from YouTrack for use with transformer.py
 """
 
-import json
 import logging
+import os
+import queue
 import sys
+import threading
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Dict, Iterator, Optional
 
 import click
 from rich.console import Console
 from rich.logging import RichHandler
 
 from config import Config
-from youtrack_client import YouTrackClient, YouTrackAPIError
+from transformer import Transformer
+from youtrack_client import YouTrackClient, YouTrackAPIError, issues_to_jsonl
 
 # Setup logging
 logging.basicConfig(
@@ -29,6 +33,63 @@ logger = logging.getLogger(__name__)
 console = Console()
 
 
+def _youtrack_client(config: Config) -> YouTrackClient:
+    """Create a YouTrack client using the configured retry settings."""
+    return YouTrackClient(
+        config.youtrack,
+        max_retries=config.migration.max_retries,
+        retry_delay=config.migration.retry_delay
+    )
+
+
+# Marks the end of the page stream in the migrate pipeline
+_END_OF_PAGES = object()
+
+# How many fetched issues may wait for the transformer before the producer blocks
+_PIPELINE_BUFFER_ISSUES = 1024
+
+
+def _produce_pages(
+    youtrack_client: YouTrackClient,
+    query: Optional[str],
+    pages: queue.Queue,
+    slots: threading.Semaphore,
+    raw_file: Optional[BinaryIO] = None
+) -> None:
+    """Fetch issue pages from YouTrack onto ``pages``; a failure is handed over to the consumer.
+    
+    A page is queued once one of ``slots`` has been taken for each of its issues.
+    When ``raw_file`` is given, every page is also appended to it as JSON Lines.
+    """
+    try:
+        for page in youtrack_client.iter_pages(query=query):
+            if raw_file is not None:
+                raw_file.write(issues_to_jsonl(page))
+            for _ in page:
+                slots.acquire()
+            pages.put(page)
+    except Exception as e:
+        pages.put(e)
+    finally:
+        pages.put(_END_OF_PAGES)
+
+
+def _consume_pages(pages: queue.Queue, slots: threading.Semaphore) -> Iterator[Dict[str, Any]]:
+    """Yield issues from the pages put on ``pages`` until the producer is done.
+    
+    Each issue's slot is handed back to the producer as soon as the issue is taken.
+    """
+    while True:
+        page = pages.get()
+        if page is _END_OF_PAGES:
+            return
+        if isinstance(page, Exception):
+            raise page
+        for issue in page:
+            slots.release()
+            yield issue
+
+
 @click.group()
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose logging')
 @click.pass_context
@@ -56,7 +117,7 @@ def test_connections(ctx):
     console.print("🔍 Testing YouTrack connection...")
     
     try:
-        youtrack_client = YouTrackClient(config.youtrack)
+        youtrack_client = _youtrack_client(config)
         success = youtrack_client.test_connection()
         
         if success:
@@ -72,29 +133,39 @@ def test_connections(ctx):
 
 @cli.command()
 @click.option('--query', '-q', help='YouTrack query string to filter issues')
-@click.option('--output-file', '-o', help='Output file for YouTrack issues (JSON)')
+@click.option('--output-file', '-o', help='Output file for YouTrack issues')
+@click.option('--format', 'output_format', type=click.Choice(['jsonl', 'json']),
+              help='Output format: JSON Lines or a single JSON array '
+                   '[default: from the --output-file extension, else jsonl]')
 # Limit parameter removed - not supported by YouTrackClient
 @click.pass_context
-def export(ctx, query: Optional[str], output_file: Optional[str]):
+def export(ctx, query: Optional[str], output_file: Optional[str], output_format: Optional[str]):
     """Export issues from YouTrack."""
     config = ctx.obj['config']
     
+    # transformer.py picks its parser from the extension, so the two must agree
+    suffix_format = {'.jsonl': 'jsonl', '.json': 'json'}.get(Path(output_file).suffix) if output_file else None
+    if output_format and suffix_format and output_format != suffix_format:
+        raise click.UsageError(f"--format {output_format} does not match the extension of {output_file}")
+    output_format = output_format or suffix_format or 'jsonl'
+    
     # Setup output path
     output_dir = Path(config.migration.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
     if not output_file:
-        output_file = str(output_dir / 'youtrack_issues.json')
+        output_file = str(output_dir / f'youtrack_issues.{output_format}')
     
     console.print("📤 Exporting issues from YouTrack...")
     console.print(f"Query: {query or 'All issues'}")
     console.print(f"Output: {output_file}")
     
     try:
-        youtrack_client = YouTrackClient(config.youtrack)
+        youtrack_client = _youtrack_client(config)
         count = youtrack_client.export_issues_to_file(
             output_file=output_file,
-            query=query
+            query=query,
+            output_format=output_format
         )
         
         console.print(f"✅ Exported {count} issues to {output_file}")
@@ -107,5 +178,71 @@ def export(ctx, query: Optional[str], output_file: Optional[str]):
         sys.exit(1)
 
 
+@cli.command()
+@click.option('--query', '-q', help='YouTrack query string to filter issues')
+@click.option('--output-file', '-o', help='Output CSV file for Linear import')
+@click.option('--save-json', is_flag=True,
+              help='Also save the raw YouTrack export to youtrack_issues.jsonl (for debugging)')
+@click.pass_context
+def migrate(ctx, query: Optional[str], output_file: Optional[str], save_json: bool):
+    """Export issues from YouTrack and write the Linear CSV in one pass."""
+    config = ctx.obj['config']
+    
+    # Setup output path
+    output_dir = Path(config.migration.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    if not output_file:
+        output_file = str(output_dir / 'linear_issues.csv')
+    
+    console.print("🚚 Migrating issues from YouTrack...")
+    console.print(f"Query: {query or 'All issues'}")
+    console.print(f"Output: {output_file}")
+    raw_output_file = str(output_dir / 'youtrack_issues.jsonl') if save_json else None
+    if raw_output_file:
+        console.print(f"Raw export: {raw_output_file}")
+    
+    try:
+        youtrack_client = _youtrack_client(config)
+        transformer = Transformer(
+            default_state=config.linear.default_state,
+            field_mapping=config.migration.field_mapping
+        )
+        
+        # Fetch pages on a background thread while this one transforms and writes them,
+        # so transformation overlaps with waiting on the network. Whole pages are queued,
+        # but the backlog is bounded in issues whatever size the pages currently have;
+        # the bound never drops below one full page so that a page always fits
+        pages = queue.Queue()
+        slots = threading.Semaphore(max(_PIPELINE_BUFFER_ISSUES, config.youtrack.max_batch_size))
+        # The raw export is kept only if the whole migration succeeds, like the CSV itself
+        raw_partial_file = raw_output_file + '.part' if raw_output_file else None
+        try:
+            with (open(raw_partial_file, 'wb') if raw_partial_file else nullcontext()) as raw_file:
+                producer = threading.Thread(
+                    target=_produce_pages,
+                    args=(youtrack_client, query, pages, slots, raw_file),
+                    daemon=True
+                )
+                producer.start()
+                count = transformer.stream_to_csv(_consume_pages(pages, slots), output_file)
+                producer.join()
+            if raw_partial_file:
+                os.replace(raw_partial_file, raw_output_file)
+        finally:
+            if raw_partial_file:
+                Path(raw_partial_file).unlink(missing_ok=True)
+        transformer.save_skip_log(str(output_dir / 'skipped_issues.log'))
+        
+        console.print(f"✅ Migrated {count} issues to {output_file}")
+        console.print("\n📋 Next steps:")
+        console.print("1. Run: linear-import (follow wizard, select 'Linear CSV import')")
+        console.print(f"2. Select {output_file}")
+        
+    except Exception as e:
+        console.print(f"❌ Migration failed: {e}")
+        sys.exit(1)
+
+
 if __name__ == '__main__':
     cli()
@@ -0,0 +1,6 @@
+"""Make the top-level modules importable when pytest is run from anywhere."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,78 @@
+"""End-to-end checks for the migrate.py commands against a stubbed YouTrack server."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+import migrate
+from config import Config, LinearConfig, MigrationConfig, YouTrackConfig
+from test_youtrack_client import FakeYouTrack, make_client, make_issues
+from transformer import read_issues
+
+
+@pytest.fixture
+def run_cli(monkeypatch, tmp_path):
+    def run(server, *args):
+        config = Config(
+            youtrack=YouTrackConfig(base_url='https://youtrack.example.com', api_token='token'),
+            linear=LinearConfig(team_key='TEAM'),
+            migration=MigrationConfig(output_dir=str(tmp_path))
+        )
+        client = make_client(monkeypatch, server)
+        monkeypatch.setattr(migrate.Config, 'from_env', lambda: config)
+        monkeypatch.setattr(migrate, '_youtrack_client', lambda config: client)
+        return CliRunner().invoke(migrate.cli, list(args))
+    return run
+
+
+def test_migrate_writes_csv_and_raw_export(run_cli, tmp_path):
+    result = run_cli(FakeYouTrack(make_issues(3000)), 'migrate', '--save-json')
+    
+    assert result.exit_code == 0, result.output
+    assert len((tmp_path / 'linear_issues.csv').read_text(encoding='utf-8').splitlines()) == 3001
+    assert len((tmp_path / 'youtrack_issues.jsonl').read_bytes().splitlines()) == 3000
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['linear_issues.csv', 'youtrack_issues.jsonl']
+
+
+def test_failed_migrate_keeps_previous_outputs(run_cli, tmp_path):
+    (tmp_path / 'linear_issues.csv').write_text('previous csv')
+    (tmp_path / 'youtrack_issues.jsonl').write_text('previous export')
+    
+    result = run_cli(FakeYouTrack(make_issues(3000), failures={1000: 400}), 'migrate', '--save-json')
+    
+    assert result.exit_code == 1
+    assert (tmp_path / 'linear_issues.csv').read_text() == 'previous csv'
+    assert (tmp_path / 'youtrack_issues.jsonl').read_text() == 'previous export'
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['linear_issues.csv', 'youtrack_issues.jsonl']
+
+
+@pytest.mark.parametrize('file_name, args', [
+    ('youtrack_issues.jsonl', []),
+    ('youtrack_issues.json', ['--format', 'json']),
+    ('out.json', ['-o', '{dir}/out.json']),
+    ('out.jsonl', ['-o', '{dir}/out.jsonl']),
+    ('out.json', ['-o', '{dir}/out.json', '--format', 'json']),
+])
+def test_export_output_is_readable_by_transformer(run_cli, tmp_path, file_name, args):
+    issues = make_issues(250)
+    result = run_cli(FakeYouTrack(issues), 'export', *(arg.format(dir=tmp_path) for arg in args))
+    
+    assert result.exit_code == 0, result.output
+    assert list(read_issues(str(tmp_path / file_name))) == issues
+
+
+def test_export_format_applies_to_other_extensions(run_cli, tmp_path):
+    issues = make_issues(10)
+    result = run_cli(FakeYouTrack(issues), 'export', '-o', str(tmp_path / 'out.txt'), '--format', 'json')
+    
+    assert result.exit_code == 0, result.output
+    assert json.loads((tmp_path / 'out.txt').read_text()) == issues
+
+
+def test_export_rejects_format_that_contradicts_extension(run_cli, tmp_path):
+    result = run_cli(FakeYouTrack(make_issues(10)), 'export', '-o', str(tmp_path / 'out.json'), '--format', 'jsonl')
+    
+    assert result.exit_code == 2
+    assert 'does not match' in result.output
+    assert list(tmp_path.iterdir()) == []
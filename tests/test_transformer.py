@@ -0,0 +1,152 @@
+"""Equivalence checks for the description converter and CSV writer in transformer.py."""
+
+import csv
+import io
+import random
+import re
+
+import pytest
+
+import transformer
+
+# Reference implementation: the single-pass regex the scanner replaced
+_WIKI_RE = re.compile(
+    r'(?P<bold>\*([^*]+)\*)'
+    r'|(?P<italic>_([^_]+)_)'
+    r'|(?P<code>\{\{([^}]+)\}\})'
+    r'|(?P<link>\[([^|]+)\|([^\]]+)\])'
+)
+
+
+def _reference_markup(text):
+    def render(match):
+        kind = match.lastgroup
+        if kind == 'bold':
+            return f"**{_reference_markup(match.group(2))}**"
+        if kind == 'italic':
+            return f"*{_reference_markup(match.group(4))}*"
+        if kind == 'code':
+            return f"```\n{_reference_markup(match.group(6))}\n```"
+        return f"[{_reference_markup(match.group(8))}]({_reference_markup(match.group(9))})"
+    
+    return _WIKI_RE.sub(render, text)
+
+
+def reference_clean_description(description):
+    if not description:
+        return None
+    return _reference_markup(description).strip()
+
+
+def python_clean_description(description):
+    """Pure-Python clean_description, even when the compiled module is loaded."""
+    if not description:
+        return None
+    return transformer._convert_markup(description).strip()
+
+
+def random_descriptions(count, seed=5):
+    rnd = random.Random(seed)
+    alphabet = 'ab *_{}[|]\n'
+    for _ in range(count):
+        yield ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 25)))
+
+
+@pytest.mark.parametrize('description, expected', [
+    (None, None),
+    ('', None),
+    ('  plain text  ', 'plain text'),
+    ('*bold* and _italic_', '**bold** and *italic*'),
+    ('{{x = 1}}', '```\nx = 1\n```'),
+    ('see [docs|https://example.com]', 'see [docs](https://example.com)'),
+    ('*bold _nested_*', '**bold *nested***'),
+    ('snake_case and a*b', 'snake_case and a*b'),
+    ('unclosed [link and {{code', 'unclosed [link and {{code'),
+])
+def test_clean_description_examples(description, expected):
+    assert transformer.clean_description(description) == expected
+    assert python_clean_description(description) == expected
+
+
+def test_scanner_matches_regex_reference():
+    mismatches = [
+        text for text in random_descriptions(50_000)
+        if python_clean_description(text) != reference_clean_description(text)
+    ]
+    assert mismatches == []
+
+
+def test_active_clean_description_matches_python():
+    mismatches = [
+        text for text in random_descriptions(50_000, seed=6)
+        if transformer.clean_description(text) != python_clean_description(text)
+    ]
+    assert mismatches == []
+
+
+def test_compiled_clean_description_matches_python():
+    transformer_fast = pytest.importorskip('transformer_fast')
+    mismatches = [
+        text for text in random_descriptions(50_000, seed=7)
+        if transformer_fast.clean_description(text) != python_clean_description(text)
+    ]
+    assert mismatches == []
+
+
+def random_fields(count, seed=8):
+    rnd = random.Random(seed)
+    alphabet = 'ab ,"\r\n\t;\'é'
+    for _ in range(count):
+        kind = rnd.random()
+        if kind < 0.05:
+            yield None
+        elif kind < 0.1:
+            yield rnd.randint(-100, 100)
+        else:
+            yield ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 12)))
+
+
+def csv_writer_line(fields):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(fields)
+    return buffer.getvalue()
+
+
+def test_csv_field_matches_csv_writer():
+    # Surround each value with other fields: csv.writer quotes a lone empty field as ""
+    mismatches = [
+        value for value in random_fields(100_000)
+        if f"x,{transformer._csv_field(value)},y\r\n" != csv_writer_line(['x', value, 'y'])
+    ]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize('default_state', [None, 'Backlog', 'In "review", maybe'])
+def test_save_to_csv_matches_csv_writer(tmp_path, default_state):
+    values = list(random_fields(2_000, seed=9))
+    issues = [{'title': title, 'description': description} for title, description in zip(values[::2], values[1::2])]
+    output_file = tmp_path / 'linear_issues.csv'
+    
+    saved = transformer.Transformer(default_state=default_state).save_to_csv(issues, str(output_file))
+    
+    expected = csv_writer_line(transformer.Transformer.FIELDNAMES) + ''.join(
+        csv_writer_line([issue['title'], issue['description'], '', '', '', '', '', '', default_state or '', ''])
+        for issue in issues
+    )
+    assert saved == len(issues)
+    assert output_file.read_bytes() == expected.encode('utf-8')
+
+
+def test_save_to_csv_keeps_previous_file_when_input_fails(tmp_path):
+    output_file = tmp_path / 'linear_issues.csv'
+    output_file.write_text('previous csv')
+    
+    def issues():
+        yield {'title': 'First', 'description': ''}
+        raise RuntimeError('export failed')
+    
+    with pytest.raises(RuntimeError):
+        transformer.Transformer().save_to_csv(issues(), str(output_file))
+    
+    assert output_file.read_text() == 'previous csv'
+    assert list(tmp_path.iterdir()) == [output_file]
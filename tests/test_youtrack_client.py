@@ -0,0 +1,250 @@
+"""Pagination checks for YouTrackClient.iter_pages against a stubbed YouTrack server."""
+
+import threading
+
+import pytest
+import requests
+
+import transformer
+import youtrack_client
+from config import YouTrackConfig
+from youtrack_client import BatchTuner, YouTrackAPIError, YouTrackClient
+
+
+def make_issues(count):
+    return [{'idReadable': f'P-{i}', 'summary': f'Issue {i}'} for i in range(count)]
+
+
+class FakeYouTrack:
+    """Serves ``issues`` for ``session.request``, optionally failing selected pages."""
+    
+    def __init__(self, issues, with_count=True, failures=None):
+        self.issues = issues
+        self.with_count = with_count
+        self.failures = dict(failures or {})  # $skip -> HTTP status, served once
+        self.pages = []  # (skip, top, status) for every page request
+        self.lock = threading.Lock()
+    
+    def request(self, method, url, params=None, **kwargs):
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        response._content = b'[]'
+        
+        if '$skip' not in params:
+            # Count request made by get_issues_count
+            if self.with_count:
+                response.headers['X-YouTrack-TotalCount'] = str(len(self.issues))
+            response._content = youtrack_client._json_dumps(self.issues[:1])
+            return response
+        
+        skip, top = params['$skip'], params['$top']
+        with self.lock:
+            status = self.failures.pop(skip, 200)
+            self.pages.append((skip, top, status))
+        
+        response.status_code = status
+        if status == 200:
+            response._content = youtrack_client._json_dumps(self.issues[skip:skip + top])
+        return response
+
+
+def make_client(monkeypatch, server, strategy='aimd', max_retries=3):
+    config = YouTrackConfig(
+        base_url='https://youtrack.example.com',
+        api_token='token',
+        batch_size=100,
+        min_batch_size=10,
+        max_batch_size=200,
+        batch_strategy=strategy,
+        max_in_flight=4
+    )
+    client = YouTrackClient(config, max_retries=max_retries, retry_delay=0)
+    monkeypatch.setattr(client.session, 'request', server.request)
+    monkeypatch.setattr(youtrack_client.time, 'sleep', lambda seconds: None)
+    return client
+
+
+@pytest.mark.parametrize('strategy', ['aimd', 'tuned'])
+@pytest.mark.parametrize('with_count', [True, False])
+@pytest.mark.parametrize('count', [0, 1, 99, 100, 250, 1234])
+def test_iter_pages_yields_every_issue_in_order(monkeypatch, strategy, with_count, count):
+    issues = make_issues(count)
+    server = FakeYouTrack(issues, with_count=with_count)
+    client = make_client(monkeypatch, server, strategy)
+    
+    pages = list(client.iter_pages())
+    
+    assert all(pages)
+    assert [issue for page in pages for issue in page] == issues
+
+
+@pytest.mark.parametrize('with_count', [True, False])
+def test_iter_pages_stops_after_short_last_page(monkeypatch, with_count):
+    issues = make_issues(250)
+    server = FakeYouTrack(issues, with_count=with_count)
+    client = make_client(monkeypatch, server)
+    
+    assert list(client.get_issues()) == issues
+    
+    # Pages requested past the end can only come from the last concurrent window
+    past_end = [skip for skip, _, _ in server.pages if skip >= len(issues)]
+    assert len(past_end) < client.config.max_in_flight
+    if with_count:
+        assert not past_end
+
+
+@pytest.mark.parametrize('strategy', ['aimd', 'tuned'])
+def test_iter_pages_retries_429_mid_window_with_smaller_batch(monkeypatch, strategy):
+    issues = make_issues(1234)
+    server = FakeYouTrack(issues, failures={200: 429})
+    client = make_client(monkeypatch, server, strategy)
+    
+    progress = []
+    result = list(client.get_issues(progress_callback=lambda current, total: progress.append(current)))
+    
+    assert result == issues
+    assert progress == sorted(progress) and progress[-1] == len(issues)
+    
+    failed = [index for index, (_, _, status) in enumerate(server.pages) if status == 429]
+    assert len(failed) == 1
+    
+    # The failed page is requested again, with a smaller batch
+    _, failed_top, _ = server.pages[failed[0]]
+    retried = [top for skip, top, status in server.pages[failed[0] + 1:] if skip == 200 and status == 200]
+    assert retried and retried[0] < failed_top
+
+
+def test_iter_pages_gives_up_after_max_retries(monkeypatch):
+    server = FakeYouTrack(make_issues(500), failures={0: 503})
+    client = make_client(monkeypatch, server, max_retries=1)
+    
+    with pytest.raises(YouTrackAPIError) as excinfo:
+        list(client.iter_pages())
+    assert excinfo.value.status_code == 503
+
+
+def test_iter_pages_does_not_retry_client_errors(monkeypatch):
+    server = FakeYouTrack(make_issues(500), failures={0: 404})
+    client = make_client(monkeypatch, server)
+    
+    with pytest.raises(YouTrackAPIError) as excinfo:
+        list(client.iter_pages())
+    assert excinfo.value.status_code == 404
+    assert [status for _, _, status in server.pages].count(404) == 1
+
+
+@pytest.mark.parametrize('output_format', ['jsonl', 'json'])
+def test_failed_export_keeps_previous_file(monkeypatch, tmp_path, output_format):
+    output_file = tmp_path / f'youtrack_issues.{output_format}'
+    output_file.write_bytes(b'previous export')
+    server = FakeYouTrack(make_issues(3000), failures={1000: 400})
+    client = make_client(monkeypatch, server)
+    
+    with pytest.raises(YouTrackAPIError):
+        client.export_issues_to_file(str(output_file), output_format=output_format)
+    
+    assert output_file.read_bytes() == b'previous export'
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+@pytest.mark.parametrize('output_format', ['jsonl', 'json'])
+def test_export_replaces_previous_file(monkeypatch, tmp_path, output_format):
+    output_file = tmp_path / f'youtrack_issues.{output_format}'
+    output_file.write_bytes(b'previous export')
+    issues = make_issues(250)
+    client = make_client(monkeypatch, FakeYouTrack(issues))
+    
+    assert client.export_issues_to_file(str(output_file), output_format=output_format) == len(issues)
+    
+    assert list(transformer.read_issues(str(output_file))) == issues
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+def tune(latency, minimum=10, maximum=1000, target_latency_s=2.0):
+    """Feed a tuner one page per probe size with the given latency model; return the fitted size."""
+    tuner = BatchTuner(minimum=minimum, maximum=maximum, target_latency_s=target_latency_s)
+    while tuner.frozen is None:
+        size = tuner.current
+        tuner.record_success(size, latency(size))
+    return tuner.frozen
+
+
+@pytest.mark.parametrize('latency, expected', [
+    (lambda size: 0.5 + 0.01 * size, 150),  # Exactly linear: 0.5s + 10ms per issue
+    (lambda size: 0.2 + 0.002 * size, 900),
+    (lambda size: 0.5 + 0.5 * size, 10),  # Even the smallest page is too slow
+    (lambda size: 1.0, 1000),  # Latency does not grow with size
+    (lambda size: 0.01 * size, 200),
+])
+def test_batch_tuner_fits_largest_size_under_target(latency, expected):
+    # The fitted line is exact up to float rounding, which may truncate one issue off
+    assert expected - 1 <= tune(latency) <= expected
+
+
+def test_batch_tuner_fits_on_p99_latency():
+    tuner = BatchTuner(minimum=10, maximum=1000, target_latency_s=2.0)
+    for size in BatchTuner.PROBE_SIZES:
+        # Mostly fast pages with one slow outlier per size; the outliers define P99
+        for _ in range(9):
+            tuner.samples.setdefault(size, []).append(0.1)
+        tuner.samples[size].append(0.5 + 0.01 * size)
+    assert tuner._fit() == 150
+
+
+def test_batch_tuner_recovers_after_failure():
+    tuner = BatchTuner(minimum=10, maximum=1000, target_latency_s=2.0)
+    
+    tuner.record_failure(tuner.current)
+    assert tuner.current == 12
+    tuner.record_failure(tuner.current)
+    assert tuner.current == 10
+    
+    # The retried page succeeds; probing resumes and the fit is unaffected
+    tuner.record_success(tuner.current, 0.6)
+    assert tuner.current == 25
+    while tuner.frozen is None:
+        tuner.record_success(tuner.current, 0.5 + 0.01 * tuner.current)
+    assert tuner.frozen == 150
+    
+    tuner.record_failure(150)
+    assert tuner.current == 75
+    tuner.record_success(75, 1.25)
+    assert tuner.current == 150
+
+
+def test_tuned_export_recovers_from_transient_failure(monkeypatch):
+    issues = make_issues(5000)
+    baseline = FakeYouTrack(issues)
+    assert list(make_client(monkeypatch, baseline, 'tuned').get_issues()) == issues
+    
+    server = FakeYouTrack(issues, failures={0: 429})
+    assert list(make_client(monkeypatch, server, 'tuned').get_issues()) == issues
+    
+    # One failed probe costs a few extra pages, not a permanently shrunken page size
+    assert len(server.pages) < 2 * len(baseline.pages)
+
+
+def test_backoff_delay_doubles_up_to_cap():
+    client = YouTrackClient(YouTrackConfig(base_url='https://youtrack.example.com', api_token='token'), retry_delay=1.0)
+    
+    for attempt, base in [(1, 1.0), (2, 2.0), (3, 4.0), (7, YouTrackClient.MAX_BACKOFF_S), (100, YouTrackClient.MAX_BACKOFF_S)]:
+        assert base <= client._backoff_delay(attempt) <= base + 0.5
+
+
+def test_make_request_retries_with_backoff(monkeypatch):
+    server = FakeYouTrack(make_issues(10), with_count=True)
+    client = make_client(monkeypatch, server)
+    statuses = iter([503, 503, 200])
+    delays = []
+    
+    def request(method, url, params=None, **kwargs):
+        response = server.request(method, url, params=params, **kwargs)
+        response.status_code = next(statuses)
+        return response
+    
+    monkeypatch.setattr(client.session, 'request', request)
+    monkeypatch.setattr(client, '_backoff_delay', lambda attempt: delays.append(attempt) or 0)
+    
+    assert client.get_issues_count() == 10
+    assert delays == [1, 2]
@@ -4,121 +4,368 @@ Simple data transformer for YouTrack to Linear migration.
 Only exports titles and descriptions to avoid complexity.
 """
 
-import json
-import csv
+import functools
+import itertools
+import logging
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+import ijson
 from rich.console import Console
 from config import Config
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    # orjson is several times faster, but the standard library parses the same documents
+    from json import loads as _json_loads
+
+logger = logging.getLogger(__name__)
 console = Console()
 
+# Characters that can open a wiki markup span, compiled once for all issues
+_MARKER_RE = re.compile(r'[*_{\[]')
+
+
+def _convert_markup(text: str) -> str:
+    """Convert YouTrack wiki markup to Markdown in a single left-to-right scan.
+    
+    Handles *bold*, _italic_, {{code}} and [text|url]. Markup nested inside a
+    matched span is converted too; unmatched markers are copied verbatim.
+    """
+    out = []
+    start = 0  # Start of the plain text not yet copied to ``out``
+    
+    # Jump straight from one potential marker to the next; plain text is skipped in C
+    marker = _MARKER_RE.search(text)
+    while marker is not None:
+        i = marker.start()
+        resume = i + 1
+        c = text[i]
+        
+        if c == '*':
+            # Bold: *text* -> **text**
+            end = text.find('*', i + 1)
+            if end > i + 1:
+                out.append(text[start:i])
+                out.append(f"**{_convert_markup(text[i + 1:end])}**")
+                resume = start = end + 1
+        
+        elif c == '_':
+            # Italic: _text_ -> *text*
+            end = text.find('_', i + 1)
+            if end > i + 1:
+                out.append(text[start:i])
+                out.append(f"*{_convert_markup(text[i + 1:end])}*")
+                resume = start = end + 1
+        
+        elif c == '{':
+            # Code blocks: {{code}} -> ```code```
+            if text.startswith('{', i + 1):
+                end = text.find('}', i + 2)
+                if end > i + 2 and text.startswith('}', end + 1):
+                    out.append(text[start:i])
+                    out.append(f"```\n{_convert_markup(text[i + 2:end])}\n```")
+                    resume = start = end + 2
+        
+        else:
+            # Links: [text|url] -> [text](url)
+            bar = text.find('|', i + 1)
+            if bar > i + 1:
+                end = text.find(']', bar + 1)
+                if end > bar + 1:
+                    out.append(text[start:i])
+                    out.append(f"[{_convert_markup(text[i + 1:bar])}]({_convert_markup(text[bar + 1:end])})")
+                    resume = start = end + 1
+        
+        marker = _MARKER_RE.search(text, resume)
+    
+    if not out:
+        return text
+    out.append(text[start:])
+    return ''.join(out)
+
+
+def clean_description(description: Optional[str]) -> Optional[str]:
+    """Clean and format description text for Linear."""
+    if not description:
+        return None
+    
+    # Conservative prefilter: plain text (the common case) needs no conversion at all,
+    # while any marker character, even one that does not end up forming markup,
+    # falls through to the full scanner
+    if _MARKER_RE.search(description) is None:
+        return description.strip()
+    
+    return _convert_markup(description).strip()
+
+
+try:
+    # Native build of clean_description, available after `cythonize -i transformer_fast.pyx`
+    from transformer_fast import clean_description
+except ImportError:
+    pass
+
+
+# Why an issue without a usable title was skipped
+_MISSING_TITLE = 'missing title'
+
+# Result of _transform_issue: the Linear issue, or None and why the issue was skipped
+TransformResult = Tuple[Optional[Dict[str, Any]], Optional[Tuple[str, str]]]
+
+
+def _transform_issue(
+    youtrack_issue: Dict[str, Any],
+    title_field: str = 'summary',
+    description_field: str = 'description'
+) -> TransformResult:
+    """Transform a single YouTrack issue to simple Linear format.
+    
+    Returns the Linear issue and None, or None and the ``(issue_id, reason)``
+    the issue was skipped for. This is a module-level function so that it can be
+    shipped to worker processes; skips are reported back rather than printed.
+    """
+    get = youtrack_issue.get
+    try:
+        # Extract only title and description; the description is not converted for
+        # issues that are skipped anyway
+        title = get(title_field)
+        title = title.strip() if title else ''
+        if not title:
+            return None, (get('idReadable', 'unknown'), _MISSING_TITLE)
+        
+        return {
+            'title': title,
+            'description': clean_description(get(description_field)) or ''
+        }, None
+        
+    except Exception as e:
+        return None, (get('idReadable', 'unknown'), str(e))
+
+
+def _available_cpus() -> int:
+    """Number of CPUs this process may run on (respects affinity masks and cgroups pinning)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _transform_parallel(
+    transform: Callable[[Dict[str, Any]], TransformResult],
+    youtrack_issues: Iterator[Dict[str, Any]],
+    chunksize: int,
+    workers: int
+) -> Iterator[TransformResult]:
+    """Transform issues on a process pool, preserving their order.
+    
+    Issues are read in windows of ``chunksize`` per worker; the next window is
+    submitted before the current one is consumed so the workers stay busy while
+    results are written out.
+    """
+    window = chunksize * workers
+    
+    # Never fork: migrate runs this while fetch threads hold locks (logging, urllib3 pools)
+    # that a forked child would inherit in whatever state they happened to be in
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method)) as executor:
+        pending = None
+        while True:
+            batch = list(itertools.islice(youtrack_issues, window))
+            results = executor.map(transform, batch, chunksize=chunksize) if batch else None
+            if pending is not None:
+                yield from pending
+            if results is None:
+                break
+            pending = results
+
+
+def _csv_field(value: Any) -> str:
+    """Format one CSV field exactly as csv.writer does with the default (excel) dialect."""
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        value = str(value)
+    if '"' in value:
+        return '"' + value.replace('"', '""') + '"'
+    if ',' in value or '\n' in value or '\r' in value:
+        return '"' + value + '"'
+    return value
+
 
 class Transformer:
     """Simple transformer that only extracts titles and descriptions."""
     
-    def __init__(self, default_state: Optional[str] = None):
+    # Below this many issues, starting worker processes costs more than it saves
+    PARALLEL_THRESHOLD = 10_000
+    PARALLEL_CHUNKSIZE = 1024
+    
+    # Columns of the Linear CSV import format
+    FIELDNAMES = (
+        'Title',
+        'Description',
+        'Created At',
+        'Updated At',
+        'Identifier',
+        'Creator Email',
+        'Assignee Email',
+        'Priority',
+        'State',
+        'Labels'
+    )
+    CSV_HEADER = ','.join(FIELDNAMES) + '\r\n'
+    
+    def __init__(self, default_state: Optional[str] = None, field_mapping: Optional[Dict[str, str]] = None):
         self.default_state = default_state
+        
+        # Resolve once which YouTrack fields feed the Linear title and description
+        sources = {linear: youtrack for youtrack, linear in (field_mapping or {}).items()}
+        self.title_field = sources.get('title', 'summary')
+        self.description_field = sources.get('description', 'description')
+        
+        # (issue_id, reason) for every issue that was skipped, reported in one summary
+        self._skipped: List[Tuple[str, str]] = []
     
     def _clean_description(self, description: Optional[str]) -> Optional[str]:
         """Clean and format description text for Linear."""
-        if not description:
-            return None
-        
-        # Remove YouTrack-specific formatting
-        cleaned = description
+        return clean_description(description)
+    
+    def transform_issue(self, youtrack_issue: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Transform a single YouTrack issue to simple Linear format."""
+        linear_issue, skipped = _transform_issue(youtrack_issue, self.title_field, self.description_field)
+        if skipped:
+            self._skipped.append(skipped)
+        return linear_issue
+    
+    def transform_issues(self, youtrack_issues: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Transform multiple YouTrack issues to simple Linear format.
         
-        # Convert YouTrack wiki markup to Markdown
-        # Bold: *text* -> **text**
-        cleaned = re.sub(r'\*([^*]+)\*', r'**\1**', cleaned)
+        Issues are transformed lazily as the result is consumed. Large inputs are
+        spread over a pool of worker processes; small ones are transformed inline.
+        """
+        console.print("🔄 Transforming issues...")
         
-        # Italic: _text_ -> *text*
-        cleaned = re.sub(r'_([^_]+)_', r'*\1*', cleaned)
+        transform = functools.partial(
+            _transform_issue,
+            title_field=self.title_field,
+            description_field=self.description_field
+        )
+        youtrack_issues = iter(youtrack_issues)
+        workers = _available_cpus()
+        head = list(itertools.islice(youtrack_issues, self.PARALLEL_THRESHOLD)) if workers > 1 else []
+        if len(head) < self.PARALLEL_THRESHOLD:
+            # Small input, or a single CPU where a worker process would only add pickling
+            # on top of the same serial work
+            results = map(transform, itertools.chain(head, youtrack_issues))
+        else:
+            # Workers only read a few fields, so ship just those columns instead of
+            # pickling every issue with all its custom fields, tags and users
+            columns = (self.title_field, self.description_field, 'idReadable')
+            projected = (
+                {key: issue[key] for key in columns if key in issue}
+                for issue in itertools.chain(head, youtrack_issues)
+            )
+            results = _transform_parallel(transform, projected, self.PARALLEL_CHUNKSIZE, workers)
         
-        # Code blocks: {{code}} -> ```code```
-        cleaned = re.sub(r'\{\{([^}]+)\}\}', r'```\n\1\n```', cleaned)
+        transformed_count = 0
+        skipped_before = len(self._skipped)
         
-        # Links: [text|url] -> [text](url)
-        cleaned = re.sub(r'\[([^|]+)\|([^\]]+)\]', r'[\1](\2)', cleaned)
+        for linear_issue, skipped in results:
+            if linear_issue:
+                transformed_count += 1
+                yield linear_issue
+            else:
+                self._skipped.append(skipped)
         
-        return cleaned.strip()
+        skipped = self._skipped[skipped_before:]
+        console.print(f"✅ Transformed {transformed_count} issues, skipped {len(skipped)}")
+        if skipped:
+            missing_title = sum(1 for _, reason in skipped if reason == _MISSING_TITLE)
+            console.print(
+                f"⚠️  Skipped {missing_title} issues without title"
+                f" and {len(skipped) - missing_title} issues that failed to transform"
+            )
+            logger.debug("Skipped issues: %s", skipped)
     
-    def transform_issue(self, youtrack_issue: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Transform a single YouTrack issue to simple Linear format."""
+    def save_to_csv(self, linear_issues: Iterable[Dict[str, Any]], output_file: str) -> int:
+        """Save issues to CSV format for Linear import.
+        
+        ``output_file`` is only replaced once every issue was written; if reading
+        ``linear_issues`` fails, an existing file is left as it was.
+        
+        Returns:
+            int: Number of issues written
+        """
+        console.print(f"💾 Saving issues to {output_file}")
+        
+        # Only Title and Description vary per row; the empty columns and the configured
+        # State are formatted once and appended to every line
+        suffix = f",,,,,,,{_csv_field(self.default_state or '')},\r\n"
+        saved_count = 0
+        
+        # The issues may be streamed from YouTrack; write next to the target and move it
+        # into place only once they all arrived, so a failure never leaves a partial CSV
+        partial_file = output_file + '.part'
         try:
-            # Extract only title and description
-            title = youtrack_issue.get('summary', '').strip()
-            description = self._clean_description(youtrack_issue.get('description'))
-            
-            if not title:
-                console.print(f"⚠️  Skipping issue with no title: {youtrack_issue.get('idReadable', 'unknown')}")
-                return None
-            
-            return {
-                'title': title,
-                'description': description or ''
-            }
-            
-        except Exception as e:
-            issue_id = youtrack_issue.get('idReadable', 'unknown')
-            console.print(f"❌ Error transforming issue {issue_id}: {e}")
-            return None
-    
-    def transform_issues(self, youtrack_issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Transform multiple YouTrack issues to simple Linear format."""
-        console.print(f"🔄 Transforming {len(youtrack_issues)} issues...")
-        
-        linear_issues = []
-        skipped = 0
-        
-        for issue in youtrack_issues:
-            transformed = self.transform_issue(issue)
-            if transformed:
-                linear_issues.append(transformed)
-            else:
-                skipped += 1
-        
-        console.print(f"✅ Transformed {len(linear_issues)} issues, skipped {skipped}")
-        return linear_issues
-    
-    def save_to_csv(self, linear_issues: List[Dict[str, Any]], output_file: str):
-        """Save issues to CSV format for Linear import."""
-        console.print(f"💾 Saving {len(linear_issues)} issues to {output_file}")
-        
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'Title',
-                'Description', 
-                'Created At',
-                'Updated At',
-                'Identifier',
-                'Creator Email',
-                'Assignee Email',
-                'Priority',
-                'State',
-                'Labels'
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for issue in linear_issues:
-                # Only populate Title and Description, leave other columns empty
-                row = {
-                    'Title': issue.get('title', ''),
-                    'Description': issue.get('description', ''),
-                    'Created At': '',  # Empty for simple import
-                    'Updated At': '',  # Empty for simple import
-                    'Identifier': '',  # Empty for simple import
-                    'Creator Email': '',  # Empty for simple import
-                    'Assignee Email': '',  # Empty for simple import
-                    'Priority': '',  # Empty for simple import
-                    'State': self.default_state or '',  # Use configured state or empty
-                    'Labels': ''  # Empty for simple import
-                }
-                writer.writerow(row)
-        
-        console.print(f"✅ Saved to {output_file}")
+            # A 1 MiB buffer means one write() system call per MiB of CSV rather than per 8 KiB
+            with open(partial_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+                csvfile.write(self.CSV_HEADER)
+                for issue in linear_issues:
+                    csvfile.write(f"{_csv_field(issue.get('title', ''))},{_csv_field(issue.get('description', ''))}{suffix}")
+                    saved_count += 1
+            os.replace(partial_file, output_file)
+        except BaseException:
+            Path(partial_file).unlink(missing_ok=True)
+            raise
+        
+        console.print(f"✅ Saved {saved_count} issues to {output_file}")
+        return saved_count
+    
+    def stream_to_csv(self, youtrack_issues: Iterable[Dict[str, Any]], output_file: str) -> int:
+        """Transform YouTrack issues and write them to the Linear CSV as they arrive.
+        
+        Nothing is held in memory beyond the issues being transformed, so the input
+        can come straight from the YouTrack API without an intermediate JSON file.
+        
+        Returns:
+            int: Number of issues written
+        """
+        return self.save_to_csv(self.transform_issues(youtrack_issues), output_file)
+    
+    def save_skip_log(self, output_file: str) -> int:
+        """Save the id and reason of every skipped issue, one tab-separated line each.
+        
+        When nothing was skipped, a log left by an earlier run is removed so that it
+        cannot be mistaken for this run's skips.
+        
+        Returns:
+            int: Number of skipped issues written
+        """
+        if not self._skipped:
+            Path(output_file).unlink(missing_ok=True)
+            return 0
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(''.join(f"{issue_id}\t{reason}\n" for issue_id, reason in self._skipped))
+        
+        console.print(f"📝 Logged {len(self._skipped)} skipped issues to {output_file}")
+        return len(self._skipped)
+
+
+def read_issues(input_file: str) -> Iterator[Dict[str, Any]]:
+    """Stream issues from a YouTrack export, either JSON Lines or a single JSON array."""
+    with open(input_file, 'rb') as f:
+        if input_file.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield _json_loads(line)
+        else:
+            # Floats only occur in fields we do not convert; skip building Decimals for them
+            yield from ijson.items(f, 'item', use_float=True)
 
 
 def main():
@@ -131,38 +378,40 @@ def main():
         console.print("Using default settings (no state configuration)")
         config = None
     
-    # Input and output files
-    input_file = 'output/youtrack_issues.json'
+    # Input and output files (JSON Lines or JSON array export)
+    input_files = ['output/youtrack_issues.jsonl', 'output/youtrack_issues.json']
     output_file = 'output/linear_issues.csv'
+    skip_log_file = 'output/skipped_issues.log'
     
     # Check input file exists
-    if not Path(input_file).exists():
-        console.print(f"❌ Input file not found: {input_file}")
+    existing = [path for path in input_files if Path(path).exists()]
+    if not existing:
+        console.print(f"❌ Input file not found: {' or '.join(input_files)}")
         console.print("Run 'python migrate.py export' first to get YouTrack data")
         return
     
-    # Load YouTrack issues
-    console.print(f"📥 Loading issues from {input_file}")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        youtrack_issues = json.load(f)
-    
-    console.print(f"📊 Loaded {len(youtrack_issues)} issues from YouTrack")
+    # Both formats may be left over from different exports; use the most recent one
+    input_file = max(existing, key=lambda path: Path(path).stat().st_mtime)
+    if len(existing) > 1:
+        console.print(f"⚠️  Found both {' and '.join(existing)}; using the newer {input_file}")
     
     # Get default state from configuration
     default_state = config.linear.default_state if config and config.linear else None
     if default_state:
         console.print(f"🎯 Using default state: {default_state}")
     
-    # Transform issues
-    transformer = Transformer(default_state=default_state)
-    linear_issues = transformer.transform_issues(youtrack_issues)
+    field_mapping = config.migration.field_mapping if config else None
+    transformer = Transformer(default_state=default_state, field_mapping=field_mapping)
     
-    # Save to CSV
-    transformer.save_to_csv(linear_issues, output_file)
+    # Stream YouTrack issues from the export straight through the transform into the CSV
+    console.print(f"📥 Loading issues from {input_file}")
+    youtrack_issues = read_issues(input_file)
+    saved_count = transformer.stream_to_csv(youtrack_issues, output_file)
+    transformer.save_skip_log(skip_log_file)
     
     console.print(f"\n🎉 Transformation complete!")
     console.print(f"📁 Output file: {output_file}")
-    console.print(f"📊 Issues ready for import: {len(linear_issues)}")
+    console.print(f"📊 Issues ready for import: {saved_count}")
     if default_state:
         console.print(f"🎯 Issues will be imported with state: {default_state}")
     console.print(f"\n📋 Next steps:")
@@ -1,49 +1,238 @@
 """YouTrack API client for retrieving issues."""
 
-import json
 import logging
-from typing import List, Dict, Any, Optional, Iterator
+import math
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Union
 from urllib.parse import urljoin, urlencode
 
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, stop_after_attempt, retry_if_exception
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
 from config import YouTrackConfig
 
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    # orjson is several times faster, but the standard library produces the same documents
+    import json
+    
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
 logger = logging.getLogger(__name__)
 console = Console()
 
 
 class YouTrackAPIError(Exception):
     """Custom exception for YouTrack API errors."""
-    pass
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+    
+    @property
+    def is_retryable(self) -> bool:
+        """Whether the request may succeed when retried (network failure or 429/5xx)."""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+class BatchController:
+    """Adaptive page size using additive-increase/multiplicative-decrease (AIMD).
+    
+    The page size grows by ``step`` after every page that completes within
+    ``target_latency_s``, shrinks by ``backoff`` when a page is too slow and is
+    halved when the server fails to serve a page.
+    """
+    
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_latency_s: float,
+        step: int = 25,
+        backoff: float = 0.9
+    ):
+        self.min = max(1, minimum)
+        self.max = max(self.min, maximum)
+        self.current = min(max(initial, self.min), self.max)
+        self.target_latency_s = target_latency_s
+        self.step = step
+        self.backoff = backoff
+    
+    def record_success(self, size: int, elapsed: float) -> None:
+        """Update the page size after a page of ``size`` issues was fetched in ``elapsed`` seconds."""
+        if elapsed < self.target_latency_s:
+            self.current = min(self.current + self.step, self.max)
+        else:
+            self._back_off()
+    
+    def record_failure(self, size: int) -> None:
+        """Halve the page size after the server failed to serve a page of ``size`` issues."""
+        self.current = max(self.min, size // 2)
+    
+    def _back_off(self) -> None:
+        self.current = max(self.min, int(self.current * self.backoff))
+
+
+class BatchTuner:
+    """Fixed page size chosen from a latency model fitted on the first pages.
+    
+    The first pages are fetched at each of ``probe_sizes``. A straight line is
+    then fitted through the P99 latency observed per size, and the largest page
+    size predicted to stay under ``target_latency_s`` is used for the rest of
+    the export. After a failed page, only the retry uses half that page's size;
+    the next successful page returns to probing or to the fitted size.
+    """
+    
+    PROBE_SIZES = (25, 50, 100, 150, 200)
+    
+    def __init__(
+        self,
+        minimum: int,
+        maximum: int,
+        target_latency_s: float,
+        probe_sizes: Tuple[int, ...] = PROBE_SIZES
+    ):
+        self.min = max(1, minimum)
+        self.max = max(self.min, maximum)
+        self.target_latency_s = target_latency_s
+        self.probe_sizes = sorted({min(max(size, self.min), self.max) for size in probe_sizes})
+        self.samples: Dict[int, List[float]] = {}
+        self.frozen: Optional[int] = None
+        self.retry: Optional[int] = None  # Page size for retrying a failed page
+    
+    @property
+    def current(self) -> int:
+        if self.retry is not None:
+            return self.retry
+        if self.frozen is not None:
+            return self.frozen
+        return next(size for size in self.probe_sizes if size not in self.samples)
+    
+    def record_success(self, size: int, elapsed: float) -> None:
+        """Record the latency of a page of ``size`` issues; fit once every probe size was seen."""
+        self.retry = None
+        if self.frozen is not None:
+            return
+        self.samples.setdefault(size, []).append(elapsed)
+        if all(size in self.samples for size in self.probe_sizes):
+            self.frozen = self._fit()
+            logger.debug(f"Batch size tuned to {self.frozen}")
+    
+    def record_failure(self, size: int) -> None:
+        """Retry with half the size after the server failed to serve a page of ``size`` issues."""
+        self.retry = max(self.min, size // 2)
+    
+    def _fit(self) -> int:
+        sizes = list(self.samples)
+        p99s = [_percentile(self.samples[size], 0.99) for size in sizes]
+        
+        if len(sizes) < 2:
+            return sizes[0]
+        
+        # Ordinary least squares for: latency = slope * size + intercept
+        mean_size = sum(sizes) / len(sizes)
+        mean_latency = sum(p99s) / len(p99s)
+        variance = sum((size - mean_size) ** 2 for size in sizes)
+        covariance = sum((size - mean_size) * (latency - mean_latency) for size, latency in zip(sizes, p99s))
+        slope = covariance / variance
+        intercept = mean_latency - slope * mean_size
+        
+        if slope <= 0:
+            # Latency does not grow with page size, so the largest page is cheapest
+            return self.max
+        
+        best = int((self.target_latency_s - intercept) / slope)
+        return min(max(best, self.min), self.max)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+def issues_to_jsonl(issues: List[Dict[str, Any]]) -> bytes:
+    """Serialize issues as JSON Lines, one issue per line."""
+    return b''.join(_json_dumps(issue) + b'\n' for issue in issues)
 
 
 class YouTrackClient:
     """Client for interacting with YouTrack REST API."""
     
-    def __init__(self, config: YouTrackConfig):
+    # Minimum number of newly exported issues between progress bar updates
+    PROGRESS_EVERY = 100
+    
+    # Longest wait between two retries, in seconds
+    MAX_BACKOFF_S = 60.0
+    
+    def __init__(self, config: YouTrackConfig, max_retries: int = 3, retry_delay: float = 1.0):
         self.config = config
+        self.max_retries = max(max_retries, 1)
+        self.retry_delay = retry_delay
         self.session = requests.Session()
         self.session.headers.update({
             'Authorization': f'Bearer {config.api_token}',
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         })
+        # requests already asks for compressed responses and keeps connections alive; all
+        # requests go to one host and pages are fetched concurrently, so keep one pool
+        # with a reusable connection per in-flight request
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.max_in_flight)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
+    def _batch_controller(self) -> Union[BatchController, BatchTuner]:
+        """Create the page size strategy configured for this client."""
+        if self.config.batch_strategy == 'tuned':
+            return BatchTuner(
+                minimum=self.config.min_batch_size,
+                maximum=self.config.max_batch_size,
+                target_latency_s=self.config.target_latency_s
+            )
+        return BatchController(
+            initial=self.config.batch_size,
+            minimum=self.config.min_batch_size,
+            maximum=self.config.max_batch_size,
+            target_latency_s=self.config.target_latency_s
+        )
+    
     def _build_url(self, endpoint: str) -> str:
         """Build full API URL from endpoint."""
         return urljoin(f"{self.config.base_url}/api/", endpoint.lstrip('/'))
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((requests.RequestException, YouTrackAPIError))
-    )
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with random jitter before retry number ``attempt`` (1-based).
+        
+        Shared by request retries and page retries so both follow one capped schedule.
+        """
+        return min(self.retry_delay * 2 ** (attempt - 1), self.MAX_BACKOFF_S) + random.uniform(0, 0.5)
+    
     def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """Make HTTP request with retry logic."""
+        retrying = Retrying(
+            stop=stop_after_attempt(self.max_retries),
+            wait=lambda retry_state: self._backoff_delay(retry_state.attempt_number),
+            retry=retry_if_exception(lambda e: isinstance(e, YouTrackAPIError) and e.is_retryable),
+            reraise=True
+        )
+        return retrying(self._send, method, endpoint, **kwargs)
+    
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Make a single HTTP request, translating failures into YouTrackAPIError."""
         url = self._build_url(endpoint)
         
         try:
@@ -51,14 +240,15 @@ class YouTrackClient:
             response.raise_for_status()
             return response
         except requests.HTTPError as e:
-            if response.status_code == 401:
-                raise YouTrackAPIError("Authentication failed. Check your API token.") from e
-            elif response.status_code == 403:
-                raise YouTrackAPIError("Access forbidden. Check your permissions.") from e
-            elif response.status_code == 404:
-                raise YouTrackAPIError("Resource not found.") from e
+            status_code = response.status_code
+            if status_code == 401:
+                raise YouTrackAPIError("Authentication failed. Check your API token.", status_code) from e
+            elif status_code == 403:
+                raise YouTrackAPIError("Access forbidden. Check your permissions.", status_code) from e
+            elif status_code == 404:
+                raise YouTrackAPIError("Resource not found.", status_code) from e
             else:
-                raise YouTrackAPIError(f"HTTP {response.status_code}: {response.text}") from e
+                raise YouTrackAPIError(f"HTTP {status_code}: {response.text}", status_code) from e
         except requests.RequestException as e:
             raise YouTrackAPIError(f"Request failed: {str(e)}") from e
     
@@ -68,7 +258,7 @@ class YouTrackClient:
             # Try the user profile endpoint first (works for most users)
             try:
                 response = self._make_request('GET', '/users/me')
-                user_info = response.json()
+                user_info = _json_loads(response.content)
                 console.print(f"✅ Connected to YouTrack as: {user_info.get('name', 'Unknown')}")
                 return True
             except YouTrackAPIError:
@@ -83,7 +273,7 @@ class YouTrackClient:
     def get_project_info(self, project_key: str) -> Dict[str, Any]:
         """Get information about a project."""
         response = self._make_request('GET', f'/admin/projects/{project_key}')
-        return response.json()
+        return _json_loads(response.content)
     
     def get_issues_count(self, query: Optional[str] = None) -> Optional[int]:
         """Get total count of issues matching the query.
@@ -112,7 +302,7 @@ class YouTrackClient:
         progress_callback: Optional[callable] = None
     ) -> Iterator[Dict[str, Any]]:
         """
-        Get all issues matching the query, yielding them in batches.
+        Get all issues matching the query, yielding them one at a time.
         
         Args:
             query: YouTrack query string (e.g., "project: {PROJECT_KEY}")
@@ -122,6 +312,27 @@ class YouTrackClient:
         Yields:
             Dict: Individual issue data
         """
+        for page in self.iter_pages(query=query, fields=fields, progress_callback=progress_callback):
+            yield from page
+    
+    def iter_pages(
+        self, 
+        query: Optional[str] = None,
+        fields: Optional[str] = None,
+        progress_callback: Optional[callable] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Get all issues matching the query, yielding them page by page.
+        
+        Args:
+            query: YouTrack query string (e.g., "project: {PROJECT_KEY}")
+            fields: Comma-separated list of fields to fetch
+            progress_callback: Optional callback function, called after every page
+                with the number of issues fetched so far and the total (if known)
+        
+        Yields:
+            List[Dict]: Issues in one page, in order
+        """
         if fields is None:
             fields = self.config.youtrack_fields if hasattr(self.config, 'youtrack_fields') else \
                 "idReadable,summary,description,created,updated,resolved,reporter(name,email)," \
@@ -140,62 +351,119 @@ class YouTrackClient:
         else:
             console.print(f"📊 Fetching issues (count unknown, will fetch all available)")
         
+        batch = self._batch_controller()
         skip = 0
         processed = 0
+        failures = 0
         
-        # Continue fetching until we get fewer issues than batch_size (or until total_count if known)
-        while total_count is None or processed < total_count:
-            params = {
-                'fields': fields,
-                '$top': self.config.batch_size,
-                '$skip': skip
-            }
-            
-            if query:
-                params['query'] = query
-            
-            try:
-                response = self._make_request('GET', '/issues', params=params)
-                issues = response.json()
-                
-                if not issues:
-                    break
-                
-                for issue in issues:
-                    yield issue
-                    processed += 1
-                    
-                    if progress_callback:
-                        progress_callback(processed, total_count)
+        # Without a total, requests past the last page are wasted; start serially and
+        # double the window each time all of its pages come back full
+        speculative = 1
+        
+        with ThreadPoolExecutor(max_workers=self.config.max_in_flight) as executor:
+            # Continue fetching until a page comes back short (or until total_count if known)
+            while total_count is None or processed < total_count:
+                # Request a window of consecutive pages at once; they are consumed in order
+                top = batch.current
+                if total_count is None:
+                    window = speculative
+                else:
+                    window = min(self.config.max_in_flight, math.ceil((total_count - processed) / top))
+                pages = [
+                    executor.submit(self._fetch_page, query, fields, skip + i * top, top)
+                    for i in range(window)
+                ]
                 
-                skip += len(issues)
+                exhausted = False
+                try:
+                    for page in pages:
+                        try:
+                            issues, elapsed = page.result()
+                        except YouTrackAPIError as e:
+                            failures += 1
+                            if not e.is_retryable or failures >= self.max_retries:
+                                logger.error(f"Error fetching issues (skip={skip}): {e}")
+                                raise
+                            # Back off, then retry from this page with half the batch size
+                            batch.record_failure(top)
+                            delay = self._backoff_delay(failures)
+                            logger.warning(
+                                f"Error fetching issues (skip={skip}): {e}; "
+                                f"retrying in {delay:.1f}s with batch size {batch.current}"
+                            )
+                            time.sleep(delay)
+                            break
+                        failures = 0
+                        batch.record_success(top, elapsed)
+                        
+                        if issues:
+                            yield issues
+                        processed += len(issues)
+                        skip += len(issues)
+                        
+                        if progress_callback:
+                            progress_callback(processed, total_count)
+                        
+                        # Stop if we got fewer issues than requested (end of results)
+                        if len(issues) < top:
+                            exhausted = True
+                            break
+                    else:
+                        speculative = min(speculative * 2, self.config.max_in_flight)
+                finally:
+                    for page in pages:
+                        page.cancel()
                 
-                # Break if we got fewer issues than requested (end of results)
-                if len(issues) < self.config.batch_size:
+                if exhausted:
                     break
-                    
-            except YouTrackAPIError as e:
-                logger.error(f"Error fetching issues (skip={skip}): {e}")
-                raise
+    
+    def _fetch_page(
+        self,
+        query: Optional[str],
+        fields: str,
+        skip: int,
+        top: int
+    ) -> Tuple[List[Dict[str, Any]], float]:
+        """Fetch a single page of issues, returning it with the request latency in seconds."""
+        params = {
+            'fields': fields,
+            '$top': top,
+            '$skip': skip
+        }
+        
+        if query:
+            params['query'] = query
+        
+        # Retries are handled by get_issues, which shrinks the batch between attempts
+        started = time.monotonic()
+        response = self._send('GET', '/issues', params=params)
+        return _json_loads(response.content), time.monotonic() - started
     
     def export_issues_to_file(
         self, 
         output_file: str, 
         query: Optional[str] = None,
-        fields: Optional[str] = None
+        fields: Optional[str] = None,
+        output_format: str = 'jsonl'
     ) -> int:
         """
-        Export issues to a JSON file.
+        Export issues to a JSON Lines file, one issue per line.
+        
+        Issues are written as they are fetched, so memory use does not grow
+        with the size of the export.
         
         Args:
             output_file: Path to output file
             query: YouTrack query string
             fields: Comma-separated list of fields to fetch
+            output_format: 'jsonl' (default) or 'json' to write a single JSON array
             
         Returns:
             int: Number of issues exported
         """
-        issues = []
+        if output_format not in ('jsonl', 'json'):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        
         exported_count = 0
         
         with Progress(
@@ -210,21 +478,42 @@ class YouTrackClient:
             total_count = self.get_issues_count(query)
             task = progress.add_task("Exporting issues...", total=total_count if total_count else None)
             
+            # Pages can shrink to a handful of issues under backoff; repaint at most every
+            # PROGRESS_EVERY issues rather than after every page
+            last_update = 0
+            
             def update_progress(current: int, total: Optional[int]):
-                progress.update(task, completed=current)
+                nonlocal last_update
+                if current - last_update >= self.PROGRESS_EVERY or current == total:
+                    progress.update(task, completed=current)
+                    last_update = current
             
+            # Write next to the target and move it into place only once the export is complete,
+            # so a failed export never replaces an earlier complete one with a truncated file
+            partial_file = output_file + '.part'
             try:
-                for issue in self.get_issues(query=query, fields=fields, progress_callback=update_progress):
-                    issues.append(issue)
-                    exported_count += 1
-                
-                # Write to file
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(issues, f, indent=2, ensure_ascii=False)
+                with open(partial_file, 'wb') as f:
+                    if output_format == 'json':
+                        f.write(b'[')
+                    
+                    for issue in self.get_issues(query=query, fields=fields, progress_callback=update_progress):
+                        if output_format == 'json':
+                            f.write(b',\n' if exported_count else b'\n')
+                            f.write(_json_dumps(issue))
+                        else:
+                            f.write(_json_dumps(issue))
+                            f.write(b'\n')
+                        exported_count += 1
+                    
+                    if output_format == 'json':
+                        f.write(b'\n]\n')
+                os.replace(partial_file, output_file)
                 
+                progress.update(task, completed=exported_count)
                 console.print(f"✅ Exported {exported_count} issues to {output_file}")
                 return exported_count
                 
             except Exception as e:
+                Path(partial_file).unlink(missing_ok=True)
                 console.print(f"❌ Export failed: {e}")
                 raise